@@ -0,0 +1,107 @@
+"""
+複数ユーザーの技術力スコア(E Score)を一括で計算する例
+
+このスクリプトは、以下の要素を与えて複数ユーザーの技術力スコア(E Score)をまとめて計算する例を示します：
+- 計算対象ユーザーごとのRawスコア（カテゴリごとの配列）
+- リファレンス集団のRawスコア（カテゴリごとの配列）
+- 計算対象ユーザーがリファレンス対象者かどうかの情報
+
+また、1ユーザーずつ計算する calculate_e_score_v2 と結果が一致することを確認します。
+"""
+
+import math
+
+import numpy
+
+from lib.lapras_score_v2.calculate_e_score_v2 import (
+    CalculateEScoreV2Args,
+    RankInfo,
+    RankInfoWithinReferenceFunctions,
+    calculate_e_score_v2,
+)
+from lib.lapras_score_v2.calculate_raw_e_score_v2_detail import RawEScoreV2Detail
+from lib.lapras_score_v2.normalize_batch import (
+    CalculateEScoreV2BatchArgs,
+    calculate_e_score_v2_batch,
+)
+
+
+def main():
+    # 1. リファレンス集団のRawスコア (カテゴリごと)
+    reference_raw_scores = {
+        'e_score_v2': numpy.array([0.5, 1.0, 1.5, 2.0, 2.5, 3.0, 3.5, 4.0]),
+        'github_score': numpy.array([0.0, 2.0, 4.0, 8.0, 16.0, 32.0, 64.0, 128.0]),
+        'tech_article_score': numpy.array([0.0, 1.0, 5.0, 10.0, 20.0, 40.0, 60.0, 80.0]),
+        'tech_event_score': numpy.array([0.0, 0.1, 0.2, 2.0, 2.1, 4.0, 6.0, 10.0]),
+        'tag_count_score': numpy.array([1.0, 2.0, 3.0, 5.0, 8.0, 13.0, 21.0, 34.0]),
+    }
+
+    # 2. 計算対象ユーザーのRawスコア (3人分)
+    raw_scores = {
+        'e_score_v2': numpy.array([3.2, 1.0, 0.05]),         # 3人目はスコアが低すぎるため判定不能
+        'github_score': numpy.array([100.0, 2.0, 0.0]),
+        'tech_article_score': numpy.array([45.0, 1.0, 0.0]),
+        'tech_event_score': numpy.array([4.1, 0.1, 0.0]),
+        'tag_count_score': numpy.array([20.0, 2.0, 0.0]),
+    }
+    # 2人目はリファレンス集団に含まれている
+    is_reference_person = numpy.array([False, True, False])
+
+    # 3. 一括計算
+    batch = calculate_e_score_v2_batch(CalculateEScoreV2BatchArgs(
+        raw_scores=raw_scores,
+        reference_raw_scores=reference_raw_scores,
+        is_reference_person=is_reference_person,
+    ))
+
+    # 4. 結果の表示
+    for i, score_data in enumerate(batch.iter_rows()):
+        print(f"\n=== ユーザー{i + 1} ===")
+        if score_data.e_score_v2 is None:
+            print("技術力スコア(E Score): 判定不能")
+            continue
+        print(f"技術力スコア(E Score): {score_data.e_score_v2:.2f}")
+        print(f"パーセンタイル: {score_data.e_score_v2_percentile:.1f}%")
+
+    # 5. 1ユーザーずつ計算した結果との一致確認
+    for i, score_data in enumerate(batch.iter_rows()):
+        expected = calculate_e_score_v2(CalculateEScoreV2Args(
+            raw_e_score_v2=raw_scores['e_score_v2'][i],
+            raw_e_score_v2_detail=RawEScoreV2Detail(
+                github_value=raw_scores['github_score'][i],
+                tech_article_value=raw_scores['tech_article_score'][i],
+                tech_event_value=raw_scores['tech_event_score'][i],
+                tag_count_value=raw_scores['tag_count_score'][i],
+            ),
+            rank_info_within_reference_functions=RankInfoWithinReferenceFunctions(
+                get_e_score_v2_rank_info=_rank_info_getter(reference_raw_scores['e_score_v2']),
+                get_github_score_rank_info=_rank_info_getter(reference_raw_scores['github_score']),
+                get_tech_article_score_rank_info=_rank_info_getter(reference_raw_scores['tech_article_score']),
+                get_tech_event_score_rank_info=_rank_info_getter(reference_raw_scores['tech_event_score']),
+                get_tag_count_score_rank_info=_rank_info_getter(reference_raw_scores['tag_count_score']),
+            ),
+            is_reference_person=bool(is_reference_person[i]),
+        ))
+        for field_name, value in score_data.model_dump().items():
+            expected_value = getattr(expected, field_name)
+            if value is None or expected_value is None:
+                is_same = value is None and expected_value is None
+            else:
+                is_same = math.isclose(value, expected_value, rel_tol=1e-9)
+            if not is_same:
+                raise ValueError(f'user{i + 1} {field_name}: batch={value}, single={expected_value}')
+
+    print("\n一括計算と1ユーザーずつの計算結果が一致しました")
+
+
+def _rank_info_getter(reference_raw_scores: numpy.ndarray):
+    """リファレンス集団のRawスコアから順位情報を返す関数を作る"""
+    return lambda args: RankInfo(
+        lower_count=int((reference_raw_scores < args.raw_score).sum()),
+        higher_count=int((reference_raw_scores > args.raw_score).sum()),
+        same_rank_count=int((reference_raw_scores == args.raw_score).sum()),
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""
+複数ユーザーの技術力スコア(Raw)を一括で計算する例
+
+このスクリプトは、複数ユーザー分の以下の要素をまとめて与えて、技術力スコア(Raw)を一括で計算する例を示します：
+- GitHubの活動（コントリビューション数、人気リポジトリ情報）
+- 技術記事（QiitaとZennの人気記事）
+- 技術イベントへの参加
+- 保有している技術タグの数
+
+また、1ユーザーずつ計算する calculate_raw_e_score_v2_detail と結果が一致することを確認します。
+"""
+
+import math
+
+from lib.lapras_score_v2.calculate_raw_e_score_v2 import (
+    calculate_raw_e_score_v2,
+)
+from lib.lapras_score_v2.calculate_raw_e_score_v2_detail import (
+    Event,
+    GitHubRepo,
+    Logger,
+    QiitaPost,
+    RawEScoreV2DetailArgs,
+    ZennArticle,
+    calculate_raw_e_score_v2_detail,
+    calculate_raw_e_score_v2_detail_batch,
+)
+
+
+def main():
+    logger = Logger(
+        debug=print,
+        info=print,
+        warning=print,
+        error=print,
+        critical=print,
+    )
+
+    # 1. スコア計算に必要な入力データの準備 (ユーザーごと)
+    args_list = [
+        # GitHub・技術記事・イベントのすべてで活動しているユーザー
+        RawEScoreV2DetailArgs(
+            github_identifier="user1",
+            github_contribution_count_list=[10, 20, 30],  # 過去3ヶ月のコントリビューション数
+            github_repos=[
+                GitHubRepo(
+                    full_name="user1/repo1",
+                    parent_repo_full_name=None,
+                    contributors_count=5,
+                    stargazers_count=100,
+                    parent_repo_contributions=0,
+                    parent_stars_count=0,
+                ),
+                GitHubRepo(
+                    full_name="user1/oss-repo1",  # forkしたリポジトリ
+                    parent_repo_full_name="parent/oss-repo1",
+                    contributors_count=15,
+                    stargazers_count=0,
+                    parent_repo_contributions=20,
+                    parent_stars_count=20,
+                    contributors=[
+                        GitHubRepo.Contributor(login="user1", contributions=20),
+                    ],
+                ),
+            ],
+            qiita_popular_posts=[
+                QiitaPost(stockers_count=100),
+                QiitaPost(stockers_count=200),
+            ],
+            zenn_popular_articles=[
+                ZennArticle(liked=100),
+            ],
+            tag_count=10.0,
+            events=[
+                Event(is_tech_event=True, is_presenter=True),
+                Event(is_tech_event=False, is_presenter=False),
+                Event(is_tech_event=True, is_presenter=False),
+            ],
+            ai_reviews=[4.0, 1.0, 2.0],
+            logger=logger,
+        ),
+        # 1年分のコントリビューションがあり、技術記事は書いていないユーザー
+        RawEScoreV2DetailArgs(
+            github_identifier="User2",
+            github_contribution_count_list=[day % 7 for day in range(365)],
+            github_repos=[
+                GitHubRepo(
+                    full_name="user2/repo1",
+                    parent_repo_full_name=None,
+                    contributors_count=2,
+                    stargazers_count=3,
+                    parent_repo_contributions=0,
+                    parent_stars_count=0,
+                    contributors=[
+                        GitHubRepo.Contributor(login="user2", contributions=50),
+                    ],
+                ),
+            ],
+            qiita_popular_posts=[],
+            zenn_popular_articles=[],
+            tag_count=3.0,
+            events=[],
+            logger=logger,
+        ),
+        # 活動データの無いユーザー
+        RawEScoreV2DetailArgs(
+            github_identifier="user3",
+            github_contribution_count_list=[],
+            github_repos=[],
+            qiita_popular_posts=[],
+            zenn_popular_articles=[],
+            tag_count=0.0,
+            events=[],
+            logger=logger,
+        ),
+    ]
+
+    # 2. 詳細スコアの一括計算
+    batch = calculate_raw_e_score_v2_detail_batch(args_list)
+
+    # 3. 結果の表示
+    for i, detail in enumerate(batch.iter_rows()):
+        print(f"\n=== ユーザー{i + 1} ===")
+        print(f"GitHubスコア: {detail.github_value:.2f}")
+        print(f"技術記事スコア: {detail.tech_article_value:.2f}")
+        print(f"技術イベントスコア: {detail.tech_event_value:.2f}")
+        print(f"技術タグスコア: {detail.tag_count_value:.2f}")
+        print(f"総合技術力スコア(Raw): {calculate_raw_e_score_v2(detail):.2f}")
+
+    # 4. 1ユーザーずつ計算した結果との一致確認
+    for i, (args, detail) in enumerate(zip(args_list, batch.iter_rows())):
+        expected = calculate_raw_e_score_v2_detail(args)
+        for field_name, value in detail.model_dump().items():
+            expected_value = getattr(expected, field_name)
+            if not math.isclose(value, expected_value, rel_tol=1e-9, abs_tol=1e-12):
+                raise ValueError(f'user{i + 1} {field_name}: batch={value}, single={expected_value}')
+
+    print("\n一括計算と1ユーザーずつの計算結果が一致しました")
+
+
+if __name__ == "__main__":
+    main()
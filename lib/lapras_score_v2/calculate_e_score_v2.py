@@ -1,7 +1,12 @@
+import math
+from dataclasses import dataclass
+from functools import lru_cache
+from statistics import NormalDist
 from typing import Callable
 import numpy
-from scipy import stats
+from numpy.typing import ArrayLike
 from pydantic import BaseModel
+from scipy import special
 from typing_extensions import TypedDict
 from lib.lapras_score_v2 import calculate_raw_e_score_v2_detail as public_calculate_raw_e_score_v2_detail
 
@@ -21,8 +26,15 @@ from lib.lapras_score_v2 import calculate_raw_e_score_v2_detail as public_calcul
 正規化の処理では、各Rawスコアをリファレンス集団内での順位情報に基づいて変換します
 """
 
+# このRawスコア未満の場合は、スコアが低すぎて判定不能とする
+MIN_SCORE_THRESHOLD = 0.12
 
-class RankInfo(BaseModel):
+# 標準正規分布 (逆累積分布関数の計算に使用する)
+_STANDARD_NORMAL = NormalDist()
+
+
+@dataclass(frozen=True, slots=True)
+class RankInfo:
     """ユーザーのスコアに基づくリファレンス集団内での順位情報
 
     このクラスは、Rawスコアに基づいて、リファレンス集団内での
@@ -37,7 +49,8 @@ class RankInfo(BaseModel):
     """当該スコアと同じスコアを持つリファレンスユーザーの数"""
 
 
-class RankInfoWithinReferenceFunctionArgs(BaseModel):
+@dataclass(frozen=True, slots=True)
+class RankInfoWithinReferenceFunctionArgs:
     raw_score: float
     """ランク付けの対象となるRawスコア"""
 
@@ -104,7 +117,8 @@ class CalculateEScoreV2Args(BaseModel):
     """リファレンス集団に属する人物かどうかを示すフラグ"""
 
 
-class NormalizedScoreWithPercentile(BaseModel):
+@dataclass(frozen=True, slots=True)
+class NormalizedScoreWithPercentile:
     """Normalizedスコアとそれがリファレンス集団の中でどの位置にいるかを保持する
     """
     score: float
@@ -113,6 +127,13 @@ class NormalizedScoreWithPercentile(BaseModel):
     """リファレンス集団の中での位置(Percentile)"""
 
 
+# 順位情報 (lower_count, higher_count, same_rank_count)
+_RankTuple = tuple[int, int, int]
+
+# スコアが低すぎて判定不能な場合の正規化結果 (score, percentile ともにNaN)
+_UNDETERMINABLE_SCORE = NormalizedScoreWithPercentile(score=math.nan, percentile=math.nan)
+
+
 def calculate_e_score_v2(args: CalculateEScoreV2Args) -> EScoreV2Data:
     """Raw技術力スコアとRaw詳細スコアから、Normalizedスコアを計算する
     """
@@ -124,60 +145,90 @@ def calculate_e_score_v2(args: CalculateEScoreV2Args) -> EScoreV2Data:
         is_reference_person=args.is_reference_person,
     )
 
-    normalized_score_with_percentile = _normalize_score(
+    e_score_v2_rank = _get_rank_within_reference(
         **common_kwargs,
         raw_score=args.raw_e_score_v2,
         get_rank_info_within_reference=args.rank_info_within_reference_functions.get_e_score_v2_rank_info,
     )
 
-    github_score_with_percentile = _normalize_score(
+    github_score_rank = _get_rank_within_reference(
         **common_kwargs,
         raw_score=args.raw_e_score_v2_detail.github_value,
         get_rank_info_within_reference=args.rank_info_within_reference_functions.get_github_score_rank_info,
     )
 
-    tech_article_score_with_percentile = _normalize_score(
+    tech_article_score_rank = _get_rank_within_reference(
         **common_kwargs,
         raw_score=args.raw_e_score_v2_detail.tech_article_value,
         get_rank_info_within_reference=args.rank_info_within_reference_functions.get_tech_article_score_rank_info,
     )
 
-    tech_event_score_with_percentile = _normalize_score(
+    tech_event_score_rank = _get_rank_within_reference(
         **common_kwargs,
         raw_score=args.raw_e_score_v2_detail.tech_event_value,
         get_rank_info_within_reference=args.rank_info_within_reference_functions.get_tech_event_score_rank_info,
     )
 
-    tag_count_score_with_percentile = _normalize_score(
+    tag_count_score_rank = _get_rank_within_reference(
         **common_kwargs,
         raw_score=args.raw_e_score_v2_detail.tag_count_value,
         get_rank_info_within_reference=args.rank_info_within_reference_functions.get_tag_count_score_rank_info,
     )
 
+    # 順位情報が同じであれば結果も同じなので、キャッシュした結果のコピーを返す
+    return _calculate_e_score_v2_from_ranks(
+        e_score_v2_rank=e_score_v2_rank,
+        github_score_rank=github_score_rank,
+        tech_article_score_rank=tech_article_score_rank,
+        tech_event_score_rank=tech_event_score_rank,
+        tag_count_score_rank=tag_count_score_rank,
+    ).model_copy()
+
+
+@lru_cache(maxsize=100_000)
+def _calculate_e_score_v2_from_ranks(
+    e_score_v2_rank: _RankTuple | None,
+    github_score_rank: _RankTuple | None,
+    tech_article_score_rank: _RankTuple | None,
+    tech_event_score_rank: _RankTuple | None,
+    tag_count_score_rank: _RankTuple | None,
+) -> EScoreV2Data:
+    """各スコアの順位情報から、Normalizedスコアを計算する
+
+    引数はすべてハッシュ可能な値なので、結果をキャッシュできる。
+    キャッシュした EScoreV2Data は呼び出し元で変更されないよう、コピーして返すこと。
+
+    Parameters:
+    * 各引数: (lower_count, higher_count, same_rank_count) の順位情報。判定不能な場合はNone
+    """
+    normalized_score_with_percentile = _normalize_rank(e_score_v2_rank)
+    github_score_with_percentile = _normalize_rank(github_score_rank)
+    tech_article_score_with_percentile = _normalize_rank(tech_article_score_rank)
+    tech_event_score_with_percentile = _normalize_rank(tech_event_score_rank)
+    tag_count_score_with_percentile = _normalize_rank(tag_count_score_rank)
+
     return EScoreV2Data(
-        e_score_v2=(normalized_score_with_percentile.score
-                    if normalized_score_with_percentile else None),
-        e_score_v2_percentile=(normalized_score_with_percentile.percentile
-                               if normalized_score_with_percentile else None),
-        github_score=(github_score_with_percentile.score
-                      if github_score_with_percentile else None),
-        github_score_percentile=(github_score_with_percentile.percentile
-                                 if github_score_with_percentile else None),
-        tech_article_score=(tech_article_score_with_percentile.score
-                            if tech_article_score_with_percentile else None),
-        tech_article_score_percentile=(tech_article_score_with_percentile.percentile
-                                       if tech_article_score_with_percentile else None),
-        tech_event_score=(tech_event_score_with_percentile.score
-                          if tech_event_score_with_percentile else None),
-        tech_event_score_percentile=(tech_event_score_with_percentile.percentile
-                                     if tech_event_score_with_percentile else None),
-        tag_count_score=(tag_count_score_with_percentile.score
-                         if tag_count_score_with_percentile else None),
-        tag_count_score_percentile=(tag_count_score_with_percentile.percentile
-                                    if tag_count_score_with_percentile else None),
+        e_score_v2=_nan_to_none(normalized_score_with_percentile.score),
+        e_score_v2_percentile=_nan_to_none(normalized_score_with_percentile.percentile),
+        github_score=_nan_to_none(github_score_with_percentile.score),
+        github_score_percentile=_nan_to_none(github_score_with_percentile.percentile),
+        tech_article_score=_nan_to_none(tech_article_score_with_percentile.score),
+        tech_article_score_percentile=_nan_to_none(tech_article_score_with_percentile.percentile),
+        tech_event_score=_nan_to_none(tech_event_score_with_percentile.score),
+        tech_event_score_percentile=_nan_to_none(tech_event_score_with_percentile.percentile),
+        tag_count_score=_nan_to_none(tag_count_score_with_percentile.score),
+        tag_count_score_percentile=_nan_to_none(tag_count_score_with_percentile.percentile),
     )
 
 
+def _nan_to_none(value: float) -> float | None:
+    """判定不能を表すNaNを、EScoreV2Dataで判定不能を表すNoneに変換する"""
+    return None if math.isnan(value) else value
+
+
+# 同じ順位情報の組み合わせは多くのユーザーで繰り返し現れるため、結果をキャッシュする
+# (戻り値の NormalizedScoreWithPercentile は frozen なので、キャッシュした値を共有しても安全)
+@lru_cache(maxsize=1 << 16)
 def _normalize_score_from_rank(
     lower_count: int,
     higher_count: int,
@@ -197,7 +248,7 @@ def _normalize_score_from_rank(
     # 補正項 (分布の端のスコアを近似的に補正するための因子)
     # 下記記事の「近似値の計算」における $\varepsilon_N$ の値
     # https://qiita.com/nunukim/items/e4470f984bee85fbb136
-    adjustment_factor = 1 - 0.5 / numpy.log(total_count + 1)
+    adjustment_factor = 1 - 0.5 / math.log(total_count + 1)
 
     # 同率順位の場合、上位・下位に半分ずつ分配する
     rank_distribution = 0.5 * same_rank_count
@@ -208,10 +259,10 @@ def _normalize_score_from_rank(
 
     # 標準正規分布に変換
     # ppf(1-x) = -ppf(x) だが、 x=1付近では桁落ちで精度が下がるので、x=0付近を使うようにする。
-    z_score = numpy.sign(
-        higher_count_adjusted - lower_count_adjusted
-    ) * stats.norm.ppf(
-        numpy.minimum(lower_count_adjusted, higher_count_adjusted)
+    # スカラー1つの変換なので、scipy.stats.norm.ppf ではなく標準ライブラリの inv_cdf を使う
+    sign = (higher_count_adjusted > lower_count_adjusted) - (higher_count_adjusted < lower_count_adjusted)
+    z_score = sign * _STANDARD_NORMAL.inv_cdf(
+        min(lower_count_adjusted, higher_count_adjusted)
         / (lower_count_adjusted + higher_count_adjusted)
     )
 
@@ -219,7 +270,7 @@ def _normalize_score_from_rank(
     adjusted_score = z_score * 0.5 + 3.0
 
     # 最終スコアを1-5の範囲に収める
-    final_score = numpy.clip(adjusted_score, 1.0, 5.0)
+    final_score = 1.0 if adjusted_score < 1.0 else 5.0 if adjusted_score > 5.0 else adjusted_score
 
     # パーセンタイルの計算
     # p = 100 × (l + c)/(l + m + c + 自分) %
@@ -234,34 +285,86 @@ def _normalize_score_from_rank(
     )
 
 
-def _normalize_score(
+def normalize_scores_from_ranks(
+    lower_counts: ArrayLike,
+    higher_counts: ArrayLike,
+    same_rank_counts: ArrayLike,
+) -> tuple[numpy.ndarray, numpy.ndarray]:
+    """順位情報の配列から、Normalizedスコアとパーセンタイルの配列をまとめて算出する
+
+    _normalize_score_from_rank と同じ計算を配列に対して一括で行います。
+    多数のユーザーのスコアを再計算するバッチ処理で使用することを想定しています。
+    (1ユーザー分の5スコア程度では、numpyの呼び出しコストの方が大きくなるため _normalize_score_from_rank を使う)
+
+    Parameters:
+    * lower_counts: 0以上の整数の配列。自分よりも順位が下の人の数。
+    * higher_counts: 0以上の整数の配列。自分よりも順位が上の人の数。
+    * same_rank_counts: 0以上の整数の配列。自分と同率順位の人の数 (自身を除く)。
+
+    Returns:
+    * (Normalizedスコアの配列, パーセンタイルの配列)
+    """
+    lower = numpy.asarray(lower_counts, dtype=numpy.float64)
+    higher = numpy.asarray(higher_counts, dtype=numpy.float64)
+    same = numpy.asarray(same_rank_counts, dtype=numpy.float64)
+
+    total_count = lower + higher + same + 1
+    adjustment_factor = 1 - 0.5 / numpy.log(total_count + 1)
+
+    rank_distribution = 0.5 * same
+    lower_adjusted = lower + rank_distribution + adjustment_factor
+    higher_adjusted = higher + rank_distribution + adjustment_factor
+
+    # ndtri は標準正規分布の逆累積分布関数 (stats.norm.ppf と同じ値を、引数検証なしで計算する)
+    z_score = numpy.sign(higher_adjusted - lower_adjusted) * special.ndtri(
+        numpy.minimum(lower_adjusted, higher_adjusted) / (lower_adjusted + higher_adjusted)
+    )
+
+    scores = numpy.clip(z_score * 0.5 + 3.0, 1.0, 5.0)
+    percentiles = 100.0 * (lower + same) / total_count
+
+    return scores, percentiles
+
+
+def _normalize_rank(rank: _RankTuple | None) -> NormalizedScoreWithPercentile:
+    """順位情報からNormalizedスコアを算出する
+
+    判定不能な場合(rankがNone)は、score, percentile ともにNaNの結果を返す
+    """
+    if rank is None:
+        return _UNDETERMINABLE_SCORE
+    return _normalize_score_from_rank(*rank)
+
+
+def _get_rank_within_reference(
     raw_score: float,
     is_reference_person: bool,
     get_rank_info_within_reference: Callable[[RankInfoWithinReferenceFunctionArgs], RankInfo],
-) -> NormalizedScoreWithPercentile | None:
-    """リファレンス集団の中での順位からスコアを計算する
+) -> _RankTuple | None:
+    """リファレンス集団の中での順位を取得する
+
+    スコアが低すぎて判定不能な場合はNoneを返す
 
     Parameters:
     * raw_score: ランク付けの対象となるRawスコア
     * is_reference_person: リファレンス集団に属する人物かどうかを示すフラグ
     * get_rank_info_within_reference: リファレンス集団の中での順位情報を取得するための関数
+
+    Returns:
+    * (lower_count, higher_count, same_rank_count)
     """
+    # スコアが低すぎる場合は判定不能 (順位情報の取得も行わない)
+    if raw_score < MIN_SCORE_THRESHOLD:
+        return None
+
     # リファレンス集団の中での順位を取得
     rank_info = get_rank_info_within_reference(RankInfoWithinReferenceFunctionArgs(
         raw_score=raw_score,
     ))
 
-    # スコアが低すぎる場合は判定不能
-    if raw_score < 0.12:
-        return None
-
     # 自分がreference_personの場合は、自分のスコアがsame_rank_countに含まれるので、-1 する
     same_rank_count = rank_info.same_rank_count
     if is_reference_person:
         same_rank_count = max(0, same_rank_count - 1)
 
-    return _normalize_score_from_rank(
-        lower_count=rank_info.lower_count,
-        higher_count=rank_info.higher_count,
-        same_rank_count=same_rank_count,
-    )
+    return (rank_info.lower_count, rank_info.higher_count, same_rank_count)
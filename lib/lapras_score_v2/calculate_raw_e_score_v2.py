@@ -1,12 +1,25 @@
-import numpy
+import math
+from operator import attrgetter
 from lib.lapras_score_v2.calculate_raw_e_score_v2_detail import RawEScoreV2Detail
-from pydantic import BaseModel
 
 """技術力スコア(Raw)を計算するモジュール
 
 各カテゴリの詳細スコア(Raw)を重み付けして、総合スコアとなる技術力スコア(Raw)を計算する。
 """
 
+# 各詳細スコア(Raw)の重み付けパラメータ (a * log(1 + b * x))
+# _FIELDS と同じ順番で並べる
+_FIELDS = ('github_value', 'tech_article_value', 'tech_event_value', 'tag_count_value')
+_PARAMS_A = (0.32, 0.21, 0.20, 0.10)
+_PARAMS_B = (1.17, 0.31, 0.54, 0.79)
+
+# 詳細RAWスコアを追加したのに重み付けを忘れていた時にエラーになるようにする
+if _FIELDS != tuple(RawEScoreV2Detail.model_fields.keys()):
+    raise ValueError(f'weight params do not match RawEScoreV2Detail fields: {tuple(RawEScoreV2Detail.model_fields.keys())}')
+
+# detail から _FIELDS の順に値を取り出す
+_get_detail_values = attrgetter(*_FIELDS)
+
 
 def calculate_raw_e_score_v2(detail: RawEScoreV2Detail) -> float:
     """
@@ -18,27 +31,8 @@ def calculate_raw_e_score_v2(detail: RawEScoreV2Detail) -> float:
     Returns:
         float: 重み付けされた総合スコア(Raw技術力スコア)
     """
+    detail_values = _get_detail_values(detail)
+    if None in detail_values:
+        raise ValueError(f'detail_value is None: {detail}')
 
-    class WeightMap(BaseModel):
-        a: float
-        b: float
-
-    PARAMS = {
-        'github_value': WeightMap(a=0.32, b=1.17),
-        'tech_article_value': WeightMap(a=0.21, b=0.31),
-        'tech_event_value': WeightMap(a=0.20, b=0.54),
-        'tag_count_value': WeightMap(a=0.10, b=0.79),
-    }
-    # detail の property をループさせて、それぞれの値を計算して合計する
-    # 詳細RAWスコアを追加したのに重み付けを忘れていた時にエラーになるようにする
-    result = 0
-    for key in detail.model_fields.keys():
-        weight_map = PARAMS.get(key, None)
-        if weight_map is None:
-            raise ValueError(f'weight_map is not defined: {key}')
-        detail_value = getattr(detail, key)
-        if detail_value is None:
-            raise ValueError(f'detail_value is None: {key}')
-        key_result = weight_map.a * numpy.log1p(weight_map.b * detail_value)
-        result += key_result
-    return result
+    return sum(a * math.log1p(b * value) for a, b, value in zip(_PARAMS_A, _PARAMS_B, detail_values))
@@ -1,8 +1,14 @@
+import heapq
+import itertools
 import math
-from typing import Callable
+from collections.abc import Iterator, Mapping
+from dataclasses import dataclass, fields
+from functools import lru_cache
+from operator import itemgetter
+from typing import Annotated, Callable, Protocol, runtime_checkable
 
 import numpy
-from pydantic import BaseModel
+from pydantic import BaseModel, BeforeValidator, ConfigDict
 
 """技術力スコアv2のRawスコアを計算するモジュール
 
@@ -26,6 +32,11 @@ from pydantic import BaseModel
 後続の正規化処理によってNormalizedスコアに変換されます。
 """
 
+# 入力データのdataclass (Contributor, ZennArticle, QiitaPost, Event) は、生成時には検証を行わない
+# GitHubRepo や RawEScoreV2DetailArgs などのPydanticモデルに渡された時点で、
+# 生成済みのインスタンスも含めて検証・型変換し直す
+_INPUT_DATACLASS_CONFIG = ConfigDict(revalidate_instances='always')
+
 
 class GitHubRepo(BaseModel):
     """GitHubリポジトリの情報を保持する
@@ -33,9 +44,15 @@ class GitHubRepo(BaseModel):
     リポジトリのスター数、コントリビューター数、およびコントリビューション情報を保持します。
     Forkされたリポジトリの場合は、オリジナルリポジトリの情報も含みます。
     """
-    class Contributor(BaseModel):
+    @dataclass(frozen=True, slots=True)
+    class Contributor:
         """リポジトリのコントリビューター情報
+
+        リポジトリごとに多数生成されるため、Pydanticモデルではなくdataclassとして定義する。
+        生成時には検証されず、GitHubRepo などに渡した時点で検証・型変換される。
         """
+        __pydantic_config__ = _INPUT_DATACLASS_CONFIG
+
         contributions: int | None
         """コントリビューション数"""
         login: str | None
@@ -59,30 +76,53 @@ class GitHubRepo(BaseModel):
     """コミット履歴から取得したコントリビューター情報 (Fork元リポジトリのみ)"""
 
 
-class ZennArticle(BaseModel):
+@dataclass(frozen=True, slots=True)
+class ZennArticle:
     """Zenn記事の情報を保持する
     """
+    __pydantic_config__ = _INPUT_DATACLASS_CONFIG
+
     liked: int
     """記事のいいね数"""
 
 
-class QiitaPost(BaseModel):
+@dataclass(frozen=True, slots=True)
+class QiitaPost:
     """Qiita記事の情報を保持する
     """
+    __pydantic_config__ = _INPUT_DATACLASS_CONFIG
+
     stockers_count: int
     """記事のストック数"""
 
 
-class Event(BaseModel):
+@dataclass(frozen=True, slots=True)
+class Event:
     """イベントの情報を保持する
     """
+    __pydantic_config__ = _INPUT_DATACLASS_CONFIG
+
     is_tech_event: bool
     """技術系イベントかどうか"""
     is_presenter: bool
     """発表者かどうか"""
 
 
-class Logger(BaseModel):
+@runtime_checkable
+class LoggerProtocol(Protocol):
+    """スコア計算で利用するロギング機能のインターフェース
+
+    各ログレベルのメソッドを持つオブジェクト (Logger や logging.Logger) を受け付けます。
+    """
+    def debug(self, msg: object, /) -> object: ...
+    def info(self, msg: object, /) -> object: ...
+    def warning(self, msg: object, /) -> object: ...
+    def error(self, msg: object, /) -> object: ...
+    def critical(self, msg: object, /) -> object: ...
+
+
+@dataclass(frozen=True, slots=True)
+class Logger:
     """ロギング関数のDI用
 
     各ログレベルに対応するCallableを保持します。
@@ -94,9 +134,37 @@ class Logger(BaseModel):
     critical: Callable
 
 
+def _validate_logger(value: object) -> object:
+    """ロギング機能を検証し、dictで渡された場合は Logger に変換する
+
+    Logger がPydanticモデルだった時と同じく、各ログレベルのCallableを持つdictも受け付ける。
+    Logger は生成時に検証されないため、インスタンスの場合も各ログレベルがCallableかどうかを検証する。
+    """
+    levels = [logger_field.name for logger_field in fields(Logger)]
+
+    if isinstance(value, Mapping):
+        for level in levels:
+            if not callable(value.get(level)):
+                raise ValueError(f'logger.{level} must be callable')
+        return Logger(**{level: value[level] for level in levels})
+
+    if isinstance(value, Logger):
+        for level in levels:
+            if not callable(getattr(value, level)):
+                raise ValueError(f'logger.{level} must be callable')
+
+    return value
+
+
+# Args のロギング機能のフィールドの型 (LoggerProtocol を満たすオブジェクト、または各ログレベルのCallableを持つdict)
+_LoggerField = Annotated[LoggerProtocol, BeforeValidator(_validate_logger)]
+
+
 class RawEScoreV2DetailArgs(BaseModel):
     """Rawスコア計算に必要なパラメータ定義
     """
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
     github_identifier: str
     """GitHub Identifier"""
     github_contribution_count_list: list[int]
@@ -113,7 +181,7 @@ class RawEScoreV2DetailArgs(BaseModel):
     """GitHubの人気リポジトリリスト"""
     ai_reviews: list[float] = []
     """AIレビューのスコアリスト"""
-    logger: Logger
+    logger: _LoggerField
     """ロギング関数"""
 
 
@@ -130,6 +198,30 @@ class RawEScoreV2Detail(BaseModel):
     """タグカウントのRawスコア"""
 
 
+class RawEScoreV2DetailBatch(BaseModel):
+    """複数ユーザー分の各カテゴリのRawスコアを、フィールドごとの配列として保持するクラス
+
+    各配列のi番目の要素が、i番目のユーザーの RawEScoreV2Detail の各フィールドに対応します。
+    """
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    github_value: numpy.ndarray
+    """GitHubのRawスコア（コントリビューションとリポジトリの評価を含む）"""
+    tech_article_value: numpy.ndarray
+    """技術記事のRawスコア（QiitaとZennの記事評価を含む）"""
+    tech_event_value: numpy.ndarray
+    """技術イベントのRawスコア"""
+    tag_count_value: numpy.ndarray
+    """タグカウントのRawスコア"""
+
+    def iter_rows(self) -> Iterator[RawEScoreV2Detail]:
+        """ユーザーごとの RawEScoreV2Detail を順に返す"""
+        field_names = list(RawEScoreV2Detail.model_fields.keys())
+        columns = [getattr(self, field_name).tolist() for field_name in field_names]
+        for values in zip(*columns):
+            yield RawEScoreV2Detail(**dict(zip(field_names, values)))
+
+
 def calculate_raw_e_score_v2_detail(args: RawEScoreV2DetailArgs) -> RawEScoreV2Detail:
     """各カテゴリのRawスコアを計算する
 
@@ -144,7 +236,9 @@ def calculate_raw_e_score_v2_detail(args: RawEScoreV2DetailArgs) -> RawEScoreV2D
     """
     # GitHub
     github_contribution_value = _get_github_contribution_value(args.github_contribution_count_list)
-    github_repo_value = _get_github_repo_value(args.github_repos, args.github_identifier, args.logger)
+    # GitHub IDの比較は大文字小文字を区別しないので、全リポジトリで使う値を最初に1回だけcasefoldしておく
+    github_identifier = args.github_identifier.casefold()
+    github_repo_value = _get_github_repo_value(args.github_repos, github_identifier, args.logger)
     github_value = github_contribution_value * 0.1 + github_repo_value
 
     # Tech Article
@@ -164,10 +258,143 @@ def calculate_raw_e_score_v2_detail(args: RawEScoreV2DetailArgs) -> RawEScoreV2D
     )
 
 
+def calculate_raw_e_score_v2_detail_batch(args_list: list[RawEScoreV2DetailArgs]) -> RawEScoreV2DetailBatch:
+    """複数ユーザー分の各カテゴリのRawスコアをまとめて計算する
+
+    calculate_raw_e_score_v2_detail と同じ計算を、ユーザー全体の配列に対して行います。
+    日別のコントリビューション数、イベント、技術記事の人気度は numpy で一括で計算し、
+    リポジトリとAIレビューのスコアはユーザーごとに計算します。
+
+    Args:
+        args_list (list[RawEScoreV2DetailArgs]): ユーザーごとの各プラットフォームからの活動データ
+
+    Returns:
+        RawEScoreV2DetailBatch: 計算された各カテゴリのRawスコアの配列
+    """
+    user_count = len(args_list)
+
+    # GitHub
+    github_contribution_values = _get_github_contribution_values(
+        [args.github_contribution_count_list for args in args_list]
+    )
+    github_repo_values = numpy.fromiter(
+        (
+            _get_github_repo_value(args.github_repos, args.github_identifier.casefold(), args.logger)
+            for args in args_list
+        ),
+        dtype=numpy.float64,
+        count=user_count,
+    )
+    github_values = github_contribution_values * 0.1 + github_repo_values
+
+    # Tech Article
+    popularity_values = _get_tech_article_popularity_values(
+        [args.qiita_popular_posts for args in args_list],
+        [args.zenn_popular_articles for args in args_list],
+    )
+    ai_review_values = numpy.fromiter(
+        (_get_tech_article_ai_review_value(args.ai_reviews) for args in args_list),
+        dtype=numpy.float64,
+        count=user_count,
+    )
+    tech_article_values = popularity_values + _W_AI_REVIEW * ai_review_values
+
+    # Tech Event
+    tech_event_values = _get_tech_event_values([args.events for args in args_list])
+
+    # Tag Count
+    tag_count_values = numpy.fromiter(
+        (args.tag_count for args in args_list), dtype=numpy.float64, count=user_count
+    )
+
+    return RawEScoreV2DetailBatch(
+        github_value=github_values,
+        tech_article_value=tech_article_values,
+        tech_event_value=tech_event_values,
+        tag_count_value=tag_count_values,
+    )
+
+
+def _get_github_contribution_values(github_contribution_count_lists: list[list[int]]) -> numpy.ndarray:
+    """複数ユーザー分のGitHubコントリビューションの値をまとめて計算
+
+    日数の異なるリストを0埋めした2次元配列にせず、1次元に連結してユーザーごとに集計する。
+
+    Args:
+        github_contribution_count_lists (list[list[int]]): ユーザーごとの日別のコントリビューション数リスト
+
+    Returns:
+        numpy.ndarray: ユーザーごとの計算された値
+    """
+    lengths = [len(counts) for counts in github_contribution_count_lists]
+    counts = numpy.fromiter(
+        itertools.chain.from_iterable(github_contribution_count_lists), dtype=numpy.int64, count=sum(lengths)
+    )
+    # 1ユーザーずつ計算する場合 (math.log1p) と同じく、負のコントリビューション数はエラーにする
+    if (counts < 0).any():
+        raise ValueError('github_contribution_count_list must not contain negative values')
+
+    user_indices = numpy.repeat(numpy.arange(len(lengths)), lengths)
+    # bincount は入力が空の場合に int64 の配列を返すので、float64 に揃える
+    return numpy.bincount(user_indices, weights=numpy.log1p(counts), minlength=len(lengths)).astype(numpy.float64)
+
+
+def _get_tech_article_popularity_values(
+    qiita_popular_posts_list: list[list[QiitaPost]],
+    zenn_popular_articles_list: list[list[ZennArticle]],
+) -> numpy.ndarray:
+    """複数ユーザー分の技術記事の人気度に基づくRawスコアをまとめて計算
+
+    Args:
+        qiita_popular_posts_list (list[list[QiitaPost]]): ユーザーごとのQiitaの人気記事リスト
+        zenn_popular_articles_list (list[list[ZennArticle]]): ユーザーごとのZennの人気記事リスト
+
+    Returns:
+        numpy.ndarray: ユーザーごとの計算された技術記事の人気度スコア
+    """
+    # QiitaとZennの上位3記事ずつを、記事の無い枠は0で埋めて (ユーザー数, 6) の配列にする
+    like_counts = numpy.zeros((len(qiita_popular_posts_list), 6), dtype=numpy.int64)
+    article_counts = numpy.zeros(len(qiita_popular_posts_list), dtype=numpy.int64)
+    for i, (qiita_popular_posts, zenn_popular_articles) in enumerate(
+        zip(qiita_popular_posts_list, zenn_popular_articles_list)
+    ):
+        qiita_like_counts = [post.stockers_count for post in qiita_popular_posts[:3]]
+        zenn_like_counts = [article.liked for article in zenn_popular_articles[:3]]
+        like_counts[i, :len(qiita_like_counts)] = qiita_like_counts
+        like_counts[i, 3:3 + len(zenn_like_counts)] = zenn_like_counts
+        article_counts[i] = len(qiita_like_counts) + len(zenn_like_counts)
+
+    # Like数が0の記事を除外した上位3記事を対象とする
+    top_like_counts = numpy.sort(like_counts, axis=1)[:, :-4:-1]
+    factors = numpy.where(top_like_counts > 0, numpy.log1p(numpy.maximum(top_like_counts, 0)), 1.0)
+    return numpy.where(article_counts > 0, factors.prod(axis=1), 0.0)
+
+
+def _get_tech_event_values(events_list: list[list[Event]]) -> numpy.ndarray:
+    """複数ユーザー分の技術イベントのRawスコアをまとめて計算
+
+    Args:
+        events_list (list[list[Event]]): ユーザーごとのイベントのリスト
+
+    Returns:
+        numpy.ndarray: ユーザーごとの計算された技術イベントスコア
+    """
+    lengths = [len(events) for events in events_list]
+    events = list(itertools.chain.from_iterable(events_list))
+    is_tech_event = numpy.fromiter((event.is_tech_event for event in events), dtype=bool, count=len(events))
+    is_presenter = numpy.fromiter((event.is_presenter for event in events), dtype=bool, count=len(events))
+
+    # 登壇者は2.0点、参加者は0.1点、技術系以外のイベントは0点
+    points = numpy.where(is_tech_event, 0.1 + 1.9 * is_presenter, 0.0)
+    user_indices = numpy.repeat(numpy.arange(len(lengths)), lengths)
+    # bincount は入力が空の場合に int64 の配列を返すので、float64 に揃える
+    return numpy.bincount(user_indices, weights=points, minlength=len(lengths)).astype(numpy.float64)
+
+
 def get_repo_stats_score(
     repo: GitHubRepo,
     github_identifier: str,
-    logger: Logger,
+    logger: LoggerProtocol,
 ) -> float:
     """リポジトリの統計情報に基づいて値を計算
 
@@ -178,45 +405,142 @@ def get_repo_stats_score(
     Args:
         repo (GitHubRepo): 対象リポジトリ
         github_identifier (str): GitHub Identifier
-        logger (Logger): ロギング機能
+        logger (LoggerProtocol): ロギング機能
 
     Returns:
         float: 計算された値
     """
-    try:
-        contributions = get_contributions_count(
-            GetContributionsCountArgs(
-                contributors=repo.contributors,
-                contributors_from_commits=repo.contributors_from_commits,
-                github_identifier=github_identifier,
-                logger=logger
-            )
+    contributions = get_contributions_count(
+        GetContributionsCountArgs(
+            contributors=repo.contributors,
+            contributors_from_commits=repo.contributors_from_commits,
+            github_identifier=github_identifier,
+            logger=logger
         )
-        primary_repo_score = float(math.log(repo.contributors_count + 2, 10)) \
-            * ((math.log((float(contributions) ** 1.2) + 10) ** 1.7)
-               * math.log(float(repo.stargazers_count / 4) ** 1.3 + 2, 10)) ** 1.2
+    )
+    return _get_repo_stats_score_from_contributions(repo, contributions, logger)
 
-        if repo.parent_repo_contributions > 0:
-            parent_repo_score = float(math.log(repo.contributors_count + 2, 10)) \
-                * ((math.log((float(repo.parent_repo_contributions) ** 1.2) + 10) ** 1.7)
-                   * math.log(float(repo.parent_stars_count / 4) ** 1.3 + 2, 10)) ** 1.2
-        else:
-            parent_repo_score = 0
 
-        return max(primary_repo_score, parent_repo_score)
+def _get_repo_stats_score_from_contributions(
+    repo: GitHubRepo,
+    contributions: int,
+    logger: LoggerProtocol,
+) -> float:
+    """取得済みのコントリビューション数を使ってリポジトリの統計情報に基づく値を計算
 
-    except TypeError as e:
-        logger.error(e)
+    repo の数値フィールドはPydanticで int として検証済みだが、負の値は許容されているため、
+    計算できない値が含まれる場合はエラーをログに出力して0を返す。
+
+    Args:
+        repo (GitHubRepo): 対象リポジトリ
+        contributions (int): 対象リポジトリにおける評価対象ユーザーのコントリビューション数
+        logger (LoggerProtocol): ロギング機能
+
+    Returns:
+        float: 計算された値
+    """
+    # 負の値は (負の数) ** 1.2 などが複素数になりスコアを計算できない
+    # 結果をキャッシュする _get_repo_stats_score_from_counts の外で判定し、呼び出しごとにログを出力する
+    # (Fork元の値は、Fork元へのコントリビューションがある場合にのみ計算に使うので、その場合だけ判定する)
+    has_negative_count = contributions < 0 or repo.stargazers_count < 0 or (
+        repo.parent_repo_contributions > 0 and repo.parent_stars_count < 0
+    )
+    if has_negative_count:
+        logger.error(ValueError(f'repo stats must not be negative: {repo.full_name}'))
         return 0
 
+    return _get_repo_stats_score_from_counts(
+        contributions,
+        repo.stargazers_count,
+        repo.contributors_count,
+        repo.parent_repo_contributions,
+        repo.parent_stars_count,
+    )
+
+
+@lru_cache(maxsize=4096)
+def _get_repo_stats_score_from_counts(
+    contributions: int,
+    stars_count: int,
+    contributors_count: int,
+    parent_repo_contributions: int,
+    parent_stars_count: int,
+) -> float:
+    """リポジトリの各種カウントからリポジトリの統計情報に基づく値を計算
+
+    スターやコントリビューターの少ないリポジトリは同じ値の組み合わせになることが多いため、結果をキャッシュする。
+    引数はすべて int で、リポジトリのオブジェクト自体はキャッシュのキーに含めない。
+
+    Args:
+        contributions (int): 対象リポジトリにおける評価対象ユーザーのコントリビューション数
+        stars_count (int): リポジトリのスター数
+        contributors_count (int): リポジトリの全コントリビューター数
+        parent_repo_contributions (int): Fork元リポジトリへのコントリビューション数
+        parent_stars_count (int): Fork元リポジトリのスター数
+
+    Returns:
+        float: 計算された値
+    """
+    # コントリビューター数の項はFork元とFork先で共通なので1回だけ計算する
+    contributors_count_log = math.log10(contributors_count + 2)
+
+    primary_repo_score = _get_repo_score(contributions, stars_count, contributors_count_log)
+
+    if parent_repo_contributions > 0:
+        parent_repo_score = _get_repo_score(parent_repo_contributions, parent_stars_count, contributors_count_log)
+    else:
+        parent_repo_score = 0
+
+    return max(primary_repo_score, parent_repo_score)
+
+
+def _get_repo_score(contributions: int, stars_count: int, contributors_count_log: float) -> float:
+    """コントリビューション数とスター数からリポジトリのスコアを計算
+
+    Args:
+        contributions (int): 評価対象ユーザーのコントリビューション数
+        stars_count (int): リポジトリのスター数
+        contributors_count_log (float): log10(リポジトリの全コントリビューター数 + 2)
+
+    Returns:
+        float: 計算された値
+    """
+    # 大半のリポジトリは値が小さいので、事前計算したテーブルを引く
+    if 0 <= contributions < _REPO_FACTOR_TABLE_SIZE:
+        contributions_factor = _CONTRIBUTIONS_FACTOR_TABLE[contributions]
+    else:
+        contributions_factor = _get_contributions_factor(contributions)
+    if 0 <= stars_count < _REPO_FACTOR_TABLE_SIZE:
+        stars_factor = _STARS_FACTOR_TABLE[stars_count]
+    else:
+        stars_factor = _get_stars_factor(stars_count)
+    return contributors_count_log * (contributions_factor * stars_factor) ** 1.2
+
+
+def _get_contributions_factor(contributions: int) -> float:
+    """リポジトリスコアのうち、コントリビューション数の項を計算"""
+    return math.log(contributions ** 1.2 + 10) ** 1.7
+
+
+def _get_stars_factor(stars_count: int) -> float:
+    """リポジトリスコアのうち、スター数の項を計算"""
+    return math.log10((stars_count / 4) ** 1.3 + 2)
+
 
-def _get_github_repo_value(repos: list[GitHubRepo], github_identifier: str, logger: Logger) -> float:
+# コントリビューション数・スター数の項を事前計算しておく範囲 (0 〜 300)
+# 範囲外の値はその都度計算するので、値に上限は設けていない
+_REPO_FACTOR_TABLE_SIZE = 301
+_CONTRIBUTIONS_FACTOR_TABLE = tuple(_get_contributions_factor(i) for i in range(_REPO_FACTOR_TABLE_SIZE))
+_STARS_FACTOR_TABLE = tuple(_get_stars_factor(i) for i in range(_REPO_FACTOR_TABLE_SIZE))
+
+
+def _get_github_repo_value(repos: list[GitHubRepo], github_identifier: str, logger: LoggerProtocol) -> float:
     """GitHubリポジトリの値を計算する
 
     Args:
         repos (list[GitHubRepo]): 評価対象のリポジトリリスト
-        github_identifier (str): 評価対象ユーザーのGitHub ID
-        logger (Logger): ロギング機能(DI)
+        github_identifier (str): 評価対象ユーザーのGitHub ID (casefold済み)
+        logger (LoggerProtocol): ロギング機能(DI)
 
     Returns:
         float: 計算された値
@@ -230,43 +554,37 @@ def _get_github_repo_value(repos: list[GitHubRepo], github_identifier: str, logg
     if not top_three_repos:
         return 0
 
-    return float(numpy.prod([math.log1p(get_repo_stats_score(repo=repo, github_identifier=github_identifier, logger=logger)) for repo in top_three_repos]))
+    # 上位リポジトリの選定時に計算したスコアをそのまま使う
+    return math.prod(math.log1p(score) for _, score in top_three_repos)
 
 
-def _get_top_n_repos(repos: list[GitHubRepo], github_identifier: str, logger: Logger, n: int) -> list[GitHubRepo]:
+def _get_top_n_repos(repos: list[GitHubRepo], github_identifier: str, logger: LoggerProtocol, n: int) -> list[tuple[GitHubRepo, float]]:
     """上位n個のリポジトリを取得
 
     Args:
         repos (list[GitHubRepo]): 評価対象のリポジトリリスト
-        github_identifier (str): 評価対象ユーザーのGitHub ID
-        logger (Logger): ロギング機能(DI)
+        github_identifier (str): 評価対象ユーザーのGitHub ID (casefold済み)
+        logger (LoggerProtocol): ロギング機能(DI)
         n (int): 上位n個のリポジトリを取得する数
 
     Returns:
-        list[GitHubRepo]: 上位n個のリポジトリ
+        list[tuple[GitHubRepo, float]]: 上位n個のリポジトリとそのスコア (スコアの高い順)
     """
-    # フォークされていて、かつコミットが少ないものは除外する
-    has_contribution_repos = [repo for repo in repos if not (
-        # フォークされているか
-        repo.parent_repo_contributions > 0
-        # コミットが少ないか
-        and get_contributions_count(GetContributionsCountArgs(
-            contributors=repo.contributors,
-            contributors_from_commits=repo.contributors_from_commits,
-            github_identifier=github_identifier,
-            logger=logger
-        )) < 3
-    )]
-
+    # コントリビューション数はリポジトリごとに1回だけ取得し、除外判定とスコア計算の両方で使う
     repos_with_scores: list[tuple[GitHubRepo, float]] = []
-    for repo in has_contribution_repos:
-        score = get_repo_stats_score(repo, github_identifier, logger)
+    for repo in repos:
+        contributions = _get_contributions_count(
+            repo.contributors, repo.contributors_from_commits, github_identifier, logger
+        )
+
+        # フォークされていて、かつコミットが少ないものは除外する
+        if repo.parent_repo_contributions > 0 and contributions < 3:
+            continue
+
+        score = _get_repo_stats_score_from_contributions(repo, contributions, logger)
         if score > 0:
             repos_with_scores.append((repo, score))
 
-    # スコアの高い順にソート
-    repos_with_scores.sort(key=lambda x: x[1], reverse=True)
-
     # fork元とfork先の中でスコアが高い方を選ぶ、スコアが同じ場合はfork元を優先する
     repos_by_full_name: dict[str, tuple[GitHubRepo, float]] = {}
     for repo, score in repos_with_scores:
@@ -281,9 +599,8 @@ def _get_top_n_repos(repos: list[GitHubRepo], github_identifier: str, logger: Lo
         if is_higher_score or is_equal_score_and_parent_repo:
             repos_by_full_name[origin_full_name] = (repo, score)
 
-    scored_repos = [repo for repo, _ in repos_by_full_name.values()]
-
-    return scored_repos[:n]
+    # 全件をソートせず、スコアの高い順に上位n個だけを取り出す
+    return heapq.nlargest(n, repos_by_full_name.values(), key=itemgetter(1))
 
 
 def _get_tech_article_popularity_value(qiita_popular_posts: list[QiitaPost], zenn_popular_articles: list[ZennArticle]) -> float:
@@ -296,26 +613,20 @@ def _get_tech_article_popularity_value(qiita_popular_posts: list[QiitaPost], zen
     Returns:
         float: 計算された技術記事の人気度スコア
     """
-    like_count_list = []
-    if qiita_popular_posts:
-        like_count_list += [
-            post.stockers_count for post in qiita_popular_posts[:3]
-        ]
-
-    if zenn_popular_articles:
-        like_count_list += [article.liked for article in zenn_popular_articles[:3]]
+    # QiitaとZennそれぞれの上位3記事の中から、全件をソートせずに上位3記事を取り出す
+    top_like_counts = heapq.nlargest(3, itertools.chain(
+        (post.stockers_count for post in itertools.islice(qiita_popular_posts, 3)),
+        (article.liked for article in itertools.islice(zenn_popular_articles, 3)),
+    ))
 
-    if len(like_count_list) == 0:
+    if not top_like_counts:
         return 0
 
-    return float(numpy.prod(
-        [
-            math.log1p(liked_count)
-            # Like数が0の記事を除外した上位3記事を対象とする
-            for liked_count in sorted(like_count_list, reverse=True)[:3]
-            if liked_count > 0
-        ]
-    ))
+    # Like数が0の記事を除外した上位3記事を対象とする
+    return math.prod(
+        (math.log1p(liked_count) for liked_count in top_like_counts if liked_count > 0),
+        start=1.0,
+    )
 
 
 def _get_tech_article_ai_review_value(ai_reviews: list[float]) -> float:
@@ -335,8 +646,12 @@ def _get_tech_article_ai_review_value(ai_reviews: list[float]) -> float:
     if not ai_reviews:
         return 0.0
 
-    exp_sum = sum(math.exp(t * max(score - theta, 0)) for score in ai_reviews)
-    return (1 / t) * math.log(exp_sum)
+    # log(Σexp(x)) を、最大値を括り出して計算する (log-sum-exp)
+    # スコアが高い場合に math.exp がオーバーフローしないようにする
+    exponents = [t * max(score - theta, 0) for score in ai_reviews]
+    max_exponent = max(exponents)
+    exp_sum = sum(math.exp(exponent - max_exponent) for exponent in exponents)
+    return (1 / t) * (max_exponent + math.log(exp_sum))
 
 
 def _get_tech_article_value(qiita_popular_posts: list[QiitaPost], zenn_popular_articles: list[ZennArticle], ai_reviews: list[float]) -> float:
@@ -350,9 +665,6 @@ def _get_tech_article_value(qiita_popular_posts: list[QiitaPost], zenn_popular_a
     Returns:
         float: 計算された技術記事スコア
     """
-    # AIレビューの重み
-    W_AI_REVIEW = 10
-
     # 人気度スコア
     popularity_score = _get_tech_article_popularity_value(qiita_popular_posts, zenn_popular_articles)
 
@@ -360,7 +672,11 @@ def _get_tech_article_value(qiita_popular_posts: list[QiitaPost], zenn_popular_a
     ai_review_score = _get_tech_article_ai_review_value(ai_reviews)
 
     # 人気度スコアとAIレビュースコアの重み付き和
-    return popularity_score + W_AI_REVIEW * ai_review_score
+    return popularity_score + _W_AI_REVIEW * ai_review_score
+
+
+# AIレビューの重み
+_W_AI_REVIEW = 10
 
 
 def _get_tech_event_value(events: list[Event]) -> float:
@@ -372,17 +688,8 @@ def _get_tech_event_value(events: list[Event]) -> float:
     Returns:
         float: 計算された技術イベントスコア
     """
-    if not events:
-        return 0.0
-
-    total_score = 0.0
-    for event in events:
-        if not event.is_tech_event:
-            continue
-        # 登壇者は2.0点、参加者は0.1点
-        total_score += 2.0 if event.is_presenter else 0.1
-
-    return total_score
+    # 登壇者は2.0点、参加者は0.1点 (0.1 + 1.9 * is_presenter)
+    return sum((0.1 + 1.9 * event.is_presenter for event in events if event.is_tech_event), 0.0)
 
 
 def _get_github_contribution_value(github_contribution_count_list: list[int]) -> float:
@@ -398,19 +705,27 @@ def _get_github_contribution_value(github_contribution_count_list: list[int]) ->
     if not github_contribution_count_list:
         return 0
 
-    return numpy.sum(numpy.log1p(github_contribution_count_list))
+    # 1ユーザー分の日数では ndarray への変換コストの方が大きいため、標準ライブラリで計算する
+    total = 0.0
+    for count in github_contribution_count_list:
+        # log1p(0) == 0 なので、コントリビューションが無い日は計算を省略する
+        if count:
+            total += math.log1p(count)
+    return total
 
 
 class GetContributionsCountArgs(BaseModel):
     """コントリビューション数を取得するためのパラメータ
     """
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
     contributors: list[GitHubRepo.Contributor]
     """対象リポジトリのコントリビューター情報"""
     contributors_from_commits: list[GitHubRepo.Contributor]
     """コミット履歴から取得したコントリビューター情報"""
     github_identifier: str
     """GitHub Identifier"""
-    logger: Logger
+    logger: _LoggerField
     """ロギング機能"""
 
 
@@ -426,24 +741,49 @@ def get_contributions_count(args: GetContributionsCountArgs) -> int:
             - github_identifier: GitHub Identifier
             - logger: ロギング機能
 
+    Returns:
+        int: コントリビューション数
+    """
+    return _get_contributions_count(
+        args.contributors,
+        args.contributors_from_commits,
+        args.github_identifier.casefold(),
+        args.logger,
+    )
+
+
+def _get_contributions_count(
+    contributors: list[GitHubRepo.Contributor],
+    contributors_from_commits: list[GitHubRepo.Contributor],
+    github_identifier: str,
+    logger: LoggerProtocol,
+) -> int:
+    """リポジトリにおける特定ユーザーのコントリビューション数を取得
+
+    GetContributionsCountArgs を生成せずに、casefold済みのGitHub IDで検索する。
+
+    Args:
+        contributors (list[GitHubRepo.Contributor]): 対象リポジトリのコントリビューター情報
+        contributors_from_commits (list[GitHubRepo.Contributor]): コミット履歴から取得したコントリビューター情報
+        github_identifier (str): GitHub Identifier (casefold済み)
+        logger (LoggerProtocol): ロギング機能
+
     Returns:
         int: コントリビューション数
     """
     try:
         contributions_count = 0
-        # /commits 経由のコントリビューターも考慮して返却する
-        contributors = args.contributors + args.contributors_from_commits
-
-        for contributor in contributors:
+        # /commits 経由のコントリビューターも考慮して返却する (リストを連結せずに順に走査する)
+        for contributor in itertools.chain(contributors, contributors_from_commits):
             if contributor.login is None:
                 raise ValueError('contributor is None')
             if contributor.contributions is None:
                 raise ValueError('contributor.contributions is None')
-            if contributor.login.casefold() == args.github_identifier.casefold():
+            if contributor.login.casefold() == github_identifier:
                 contributions_count = contributor.contributions
                 break
 
         return contributions_count
     except (AttributeError, KeyError, TypeError, ValueError) as e:
-        args.logger.error(e)
+        logger.error(e)
         return 0
@@ -0,0 +1,157 @@
+import math
+from collections.abc import Iterator
+
+import numpy
+from numpy.typing import ArrayLike
+from pydantic import BaseModel, ConfigDict
+
+from lib.lapras_score_v2.calculate_e_score_v2 import (
+    MIN_SCORE_THRESHOLD,
+    EScoreV2Data,
+    normalize_scores_from_ranks,
+)
+
+"""リファレンス集団全体のスコアを一括で再計算するためのモジュール
+
+多数のユーザーのRawスコアまたは順位情報から、Normalizedスコアとパーセンタイルをまとめて計算します。
+順位情報はユーザーごとの関数呼び出しではなく、ソートしたリファレンス集団のRawスコアに対する二分探索で一括で求めます。
+正規化は numpy によるベクトル化実装 (normalize_scores_from_ranks) で計算します。
+"""
+
+SCORE_CATEGORIES = (
+    'e_score_v2',
+    'github_score',
+    'tech_article_score',
+    'tech_event_score',
+    'tag_count_score',
+)
+"""一括計算の対象となるスコアのカテゴリ (EScoreV2Data のフィールド名に対応する)"""
+
+
+class CalculateEScoreV2BatchArgs(BaseModel):
+    """技術力スコアv2を複数ユーザー分まとめて計算するための入力パラメータを定義する
+    """
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    raw_scores: dict[str, numpy.ndarray]
+    """カテゴリごとの計算対象ユーザーのRawスコアの配列 (キーは SCORE_CATEGORIES、各配列の長さはユーザー数)"""
+    reference_raw_scores: dict[str, numpy.ndarray]
+    """カテゴリごとのリファレンス集団のRawスコアの配列 (キーは SCORE_CATEGORIES、ソートされている必要はない)"""
+    is_reference_person: numpy.ndarray
+    """計算対象ユーザーがリファレンス集団に属する人物かどうかを示すフラグの配列"""
+
+
+class EScoreV2DataBatch(BaseModel):
+    """複数ユーザー分の技術力スコアv2の計算結果を、フィールドごとの配列として保持するクラス
+
+    各配列のi番目の要素が、i番目のユーザーの EScoreV2Data の各フィールドに対応します。
+    正規化処理が実行できない場合は、Noneの代わりにNaNが設定されます。
+    """
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    e_score_v2: numpy.ndarray
+    """技術力スコアv2(Normalized)"""
+    e_score_v2_percentile: numpy.ndarray
+    """技術力スコアv2がリファレンス集団の中でどの位置にいるか(Percentile)"""
+    github_score: numpy.ndarray
+    """GitHubスコア(Normalized)"""
+    github_score_percentile: numpy.ndarray
+    """GitHubがリファレンス集団の中でどの位置にいるか(Percentile)"""
+    tech_article_score: numpy.ndarray
+    """技術記事スコア(Normalized)"""
+    tech_article_score_percentile: numpy.ndarray
+    """技術記事がリファレンス集団の中でどの位置にいるか(Percentile)"""
+    tech_event_score: numpy.ndarray
+    """技術イベントスコア(Normalized)"""
+    tech_event_score_percentile: numpy.ndarray
+    """技術イベントがリファレンス集団の中でどの位置にいるか(Percentile)"""
+    tag_count_score: numpy.ndarray
+    """タグカウントスコア(Normalized)"""
+    tag_count_score_percentile: numpy.ndarray
+    """タグカウントがリファレンス集団の中でどの位置にいるか(Percentile)"""
+
+    def iter_rows(self) -> Iterator[EScoreV2Data]:
+        """ユーザーごとの EScoreV2Data を順に返す (NaNはNoneに変換する)"""
+        field_names = list(EScoreV2Data.model_fields.keys())
+        columns = [getattr(self, field_name).tolist() for field_name in field_names]
+        for values in zip(*columns):
+            yield EScoreV2Data(**{
+                field_name: None if math.isnan(value) else value
+                for field_name, value in zip(field_names, values)
+            })
+
+
+def calculate_e_score_v2_batch(args: CalculateEScoreV2BatchArgs) -> EScoreV2DataBatch:
+    """複数ユーザーのRawスコアから、Normalizedスコアとパーセンタイルをまとめて計算する
+
+    calculate_e_score_v2 と同じ計算を、リファレンス集団のRawスコアを共有して一括で行います。
+    スコアが低すぎて判定不能なユーザーの値はNaNになります。
+    """
+    is_reference_person = numpy.asarray(args.is_reference_person, dtype=bool)
+
+    results: dict[str, numpy.ndarray] = {}
+    for category in SCORE_CATEGORIES:
+        raw_scores = numpy.asarray(args.raw_scores[category], dtype=numpy.float64)
+        lower_counts, higher_counts, same_rank_counts = _get_ranks_within_reference(
+            raw_scores=raw_scores,
+            reference_raw_scores=args.reference_raw_scores[category],
+        )
+
+        # 自分がreference_personの場合は、自分のスコアがsame_rank_countに含まれるので、-1 する
+        same_rank_counts = numpy.maximum(same_rank_counts - is_reference_person, 0)
+
+        scores, percentiles = normalize_ranks_batch(lower_counts, higher_counts, same_rank_counts)
+
+        # スコアが低すぎる場合は判定不能
+        is_undeterminable = raw_scores < MIN_SCORE_THRESHOLD
+        scores[is_undeterminable] = numpy.nan
+        percentiles[is_undeterminable] = numpy.nan
+
+        results[category] = scores
+        results[f'{category}_percentile'] = percentiles
+
+    return EScoreV2DataBatch(**results)
+
+
+def _get_ranks_within_reference(
+    raw_scores: numpy.ndarray,
+    reference_raw_scores: ArrayLike,
+) -> tuple[numpy.ndarray, numpy.ndarray, numpy.ndarray]:
+    """リファレンス集団の中での順位情報を、二分探索でまとめて取得する
+
+    Parameters:
+    * raw_scores: ランク付けの対象となるRawスコアの配列
+    * reference_raw_scores: リファレンス集団のRawスコアの配列
+
+    Returns:
+    * (lower_countの配列, higher_countの配列, same_rank_countの配列)
+    """
+    reference = numpy.sort(numpy.asarray(reference_raw_scores, dtype=numpy.float64))
+    lower_counts = numpy.searchsorted(reference, raw_scores, side='left')
+    upper_counts = numpy.searchsorted(reference, raw_scores, side='right')
+    return lower_counts, reference.size - upper_counts, upper_counts - lower_counts
+
+
+def normalize_ranks_batch(
+    lower_counts: ArrayLike,
+    higher_counts: ArrayLike,
+    same_rank_counts: ArrayLike,
+) -> tuple[numpy.ndarray, numpy.ndarray]:
+    """順位情報の配列から、Normalizedスコアとパーセンタイルの配列を一括で算出する
+
+    Parameters:
+    * lower_counts: 0以上の整数の1次元配列。自分よりも順位が下の人の数。
+    * higher_counts: 0以上の整数の1次元配列。自分よりも順位が上の人の数。
+    * same_rank_counts: 0以上の整数の1次元配列。自分と同率順位の人の数 (自身を除く)。
+
+    Returns:
+    * (Normalizedスコアの配列, パーセンタイルの配列)
+    """
+    # 形の異なる配列がブロードキャストされて、ユーザー数と異なる長さの結果が返らないようにする
+    lower = numpy.asarray(lower_counts, dtype=numpy.float64)
+    higher = numpy.asarray(higher_counts, dtype=numpy.float64)
+    same = numpy.asarray(same_rank_counts, dtype=numpy.float64)
+    if lower.ndim != 1 or lower.shape != higher.shape or lower.shape != same.shape:
+        raise ValueError('lower_counts, higher_counts, same_rank_counts must be 1-D arrays of the same length')
+
+    return normalize_scores_from_ranks(lower, higher, same)